@@ -1,12 +1,26 @@
+import os
+os.environ.setdefault("PYGAME_BLEND_ALPHA_SDL2", "1")
+
 import pygame
 import pygame_gui
+import numpy as np
 from collections import deque
+from functools import lru_cache
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda func: func
 
 pygame.init()
 
 info = pygame.display.Info()
 SCREEN_WIDTH, SCREEN_HEIGHT = info.current_w, info.current_h
 NAVBAR_HEIGHT = 60
+MOVE_DELAY = 0.15
+ACTIONS = ("up", "down", "left", "right")
+KEY_DIRECTIONS = {pygame.K_UP: "up", pygame.K_DOWN: "down", pygame.K_LEFT: "left", pygame.K_RIGHT: "right"}
 
 class Node:
     def __init__(self, state, parent, action):
@@ -17,12 +31,14 @@ class Node:
 class StackFrontier:
     def __init__(self):
         self.frontier = []
+        self.states = set()
 
     def add(self, node):
         self.frontier.append(node)
+        self.states.add(node.state)
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.states
 
     def empty(self):
         return not self.frontier
@@ -30,17 +46,21 @@ class StackFrontier:
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
-        return self.frontier.pop()
+        node = self.frontier.pop()
+        self.states.discard(node.state)
+        return node
 
 class QueueFrontier:
     def __init__(self):
         self.frontier = deque()
+        self.states = set()
 
     def add(self, node):
         self.frontier.append(node)
+        self.states.add(node.state)
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.states
 
     def empty(self):
         return not self.frontier
@@ -48,31 +68,83 @@ class QueueFrontier:
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
-        return self.frontier.popleft()
+        node = self.frontier.popleft()
+        self.states.discard(node.state)
+        return node
+
+@njit(cache=True)
+def _bfs_numba(adj, start_idx, goal_idx):
+    size = adj.shape[0]
+    parent = np.full(size, -1, np.int32)
+    visited = np.zeros(size, np.uint8)
+    queue = np.empty(size, np.int32)
+    head, tail = 0, 1
+    queue[0] = start_idx
+    visited[start_idx] = 1
+    num_explored = 0
+
+    while head < tail:
+        idx = queue[head]
+        head += 1
+        num_explored += 1
+        if idx == goal_idx:
+            break
+        for k in range(4):
+            n = adj[idx, k]
+            if n >= 0 and not visited[n]:
+                visited[n] = 1
+                parent[n] = idx
+                queue[tail] = n
+                tail += 1
+
+    return parent, num_explored
+
+@lru_cache(maxsize=8)
+def _parse_maze(filename):
+    with open(filename) as f:
+        contents = f.read()
+
+    if contents.count("A") != 1 or contents.count("B") != 1:
+        raise Exception("maze must have exactly one start point and one goal")
+
+    contents = contents.splitlines()
+    height = len(contents)
+    width = max(len(line) for line in contents)
+    grid = np.array([list(line.ljust(width)) for line in contents])
+    walls = ~np.isin(grid, (' ', 'A', 'B'))
+    walls.flags.writeable = False
+    start = tuple(int(i) for i in np.argwhere(grid == 'A')[0])
+    goal = tuple(int(i) for i in np.argwhere(grid == 'B')[0])
+
+    open_cells = ~walls
+    idx = np.arange(height * width, dtype=np.int32).reshape(height, width)
+    adj = np.full((height, width, 4), -1, dtype=np.int32)
+    adj[1:, :, 0] = np.where(open_cells[1:] & open_cells[:-1], idx[:-1], -1)
+    adj[:-1, :, 1] = np.where(open_cells[:-1] & open_cells[1:], idx[1:], -1)
+    adj[:, 1:, 2] = np.where(open_cells[:, 1:] & open_cells[:, :-1], idx[:, :-1], -1)
+    adj[:, :-1, 3] = np.where(open_cells[:, :-1] & open_cells[:, 1:], idx[:, 1:], -1)
+    adj = adj.reshape(height * width, 4)
+    adj.flags.writeable = False
+    neighbor_table = tuple(tuple((ACTIONS[k], divmod(n, width)) for k, n in enumerate(row) if n >= 0) for row in adj.tolist())
+    return walls, adj, neighbor_table, start, goal, height, width
+
+_STATIC_SURFACES = {}
+_SOLUTION_CACHE = {}
 
 class Maze:
     def __init__(self, filename):
-        with open(filename) as f:
-            contents = f.read()
-
-        if contents.count("A") != 1 or contents.count("B") != 1:
-            raise Exception("maze must have exactly one start point and one goal")
+        self.static_surface = None
+        self.reload(filename)
 
-        contents = contents.splitlines()
-        self.height = len(contents)
-        self.width = max(len(line) for line in contents)
-
-        self.walls = [[True if cell != ' ' and cell != 'A' and cell != 'B' else False for cell in line] for line in contents]
-        self.start = [(i, j) for i, line in enumerate(contents) for j, cell in enumerate(line) if cell == 'A'][0]
-        self.goal = [(i, j) for i, line in enumerate(contents) for j, cell in enumerate(line) if cell == 'B'][0]
+    def reload(self, filename):
+        self.filename = filename
+        self.walls, self.adj, self._neighbor_table, self.start, self.goal, self.height, self.width = _parse_maze(filename)
 
         self.solution = None
         self.player_pos = self.start
 
     def neighbors(self, state):
-        row, col = state
-        candidates = [("up", (row - 1, col)), ("down", (row + 1, col)), ("left", (row, col - 1)), ("right", (row, col + 1))]
-        return [(action, (r, c)) for action, (r, c) in candidates if 0 <= r < self.height and 0 <= c < self.width and not self.walls[r][c]]
+        return self._neighbor_table[state[0] * self.width + state[1]]
 
     def solve(self, frontier):
         self.num_explored = 0
@@ -100,11 +172,50 @@ class Maze:
 
         return False
 
+    def _solve_cached(self, algorithm, search):
+        key = (self.filename, algorithm)
+        if key not in _SOLUTION_CACHE:
+            found = search()
+            _SOLUTION_CACHE[key] = (self.solution if found else None, self.num_explored)
+        self.solution, self.num_explored = _SOLUTION_CACHE[key]
+        return self.solution is not None
+
     def solve_dfs(self):
-        return self.solve(StackFrontier())
+        return self._solve_cached("dfs", lambda: self.solve(StackFrontier()))
 
     def solve_bfs(self):
-        return self.solve(QueueFrontier())
+        return self._solve_cached("bfs", lambda: self.solve(QueueFrontier()))
+
+    def solve_bfs_fast(self):
+        return self._solve_cached("bfs", self._bfs_fast)
+
+    def _bfs_fast(self):
+        start_idx = self.start[0] * self.width + self.start[1]
+        goal_idx = self.goal[0] * self.width + self.goal[1]
+        parent, self.num_explored = _bfs_numba(self.adj, start_idx, goal_idx)
+        if parent[goal_idx] < 0:
+            return False
+
+        moves = {-self.width: "up", self.width: "down", -1: "left", 1: "right"}
+        actions, cells = [], []
+        idx = goal_idx
+        while idx != start_idx:
+            prev = int(parent[idx])
+            actions.append(moves[idx - prev])
+            cells.append(divmod(idx, self.width))
+            idx = prev
+        actions.reverse(), cells.reverse()
+        self.solution = (actions, cells)
+        return True
+
+    def rebuild_cache(self, cell_size, wall_img, path_img):
+        key = (self.filename, cell_size)
+        if key not in _STATIC_SURFACES:
+            surface = pygame.Surface((self.width * cell_size, self.height * cell_size)).convert()
+            surface.fblits([(wall_img if wall else path_img, (j * cell_size, i * cell_size))
+                            for i, row in enumerate(self.walls) for j, wall in enumerate(row)])
+            _STATIC_SURFACES[key] = surface
+        self.static_surface = _STATIC_SURFACES[key]
 
     def move_player(self, direction):
         row, col = self.player_pos
@@ -114,28 +225,27 @@ class Maze:
             "left": (row, col - 1),
             "right": (row, col + 1)
         }.get(direction)
-        if new_pos and 0 <= new_pos[0] < self.height and 0 <= new_pos[1] < self.width and not self.walls[new_pos[0]][new_pos[1]]:
+        if new_pos and 0 <= new_pos[0] < self.height and 0 <= new_pos[1] < self.width and not self.walls[new_pos]:
             self.player_pos = new_pos
 
 def calculate_cell_size(maze):
     cell_width, cell_height = SCREEN_WIDTH // maze.width, (SCREEN_HEIGHT - NAVBAR_HEIGHT) // maze.height
     return min(cell_width, cell_height)
 
-def draw_maze(screen, maze, cell_size, images, show_solution=False):
-    wall_img, path_img, start_img, goal_img, step_img, player_img = (pygame.transform.scale(img, (cell_size, cell_size)) for img in images)
+def build_scaled_tiles(images, cell_size):
+    return [pygame.transform.scale(img, (cell_size, cell_size)).convert_alpha() for img in images]
+
+def draw_maze(screen, maze, cell_size, tiles, show_solution=False):
+    start_img, goal_img, step_img, player_img = tiles[2:]
     maze_width_in_pixels = maze.width * cell_size
     maze_height_in_pixels = maze.height * cell_size
     offset_x = (SCREEN_WIDTH - maze_width_in_pixels) // 2
     offset_y = (SCREEN_HEIGHT - NAVBAR_HEIGHT - maze_height_in_pixels) // 2 + NAVBAR_HEIGHT
 
-    for i, row in enumerate(maze.walls):
-        for j, wall in enumerate(row):
-            img = wall_img if wall else path_img
-            screen.blit(img, (j * cell_size + offset_x, i * cell_size + offset_y))
+    screen.blit(maze.static_surface, (offset_x, offset_y))
 
     if show_solution and maze.solution:
-        for cell in maze.solution[1]:
-            screen.blit(step_img, (cell[1] * cell_size + offset_x, cell[0] * cell_size + offset_y))
+        screen.fblits([(step_img, (cell[1] * cell_size + offset_x, cell[0] * cell_size + offset_y)) for cell in maze.solution[1]])
 
     screen.blit(start_img, (maze.start[1] * cell_size + offset_x, maze.start[0] * cell_size + offset_y))
     screen.blit(goal_img, (maze.goal[1] * cell_size + offset_x, maze.goal[0] * cell_size + offset_y))
@@ -145,10 +255,13 @@ def main():
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
     pygame.display.set_caption("Laberinto Interactivo")
     
-    images = [pygame.image.load(img) for img in ["wall.png", "path.png", "start.png", "goal.png", "step.png", "player.png"]]
-    background_image = pygame.image.load("background.png")
-    alert_image = pygame.image.load("alert.png")
-    impossible_image = pygame.image.load("impossible.png")
+    images = [pygame.image.load(img).convert_alpha() for img in ["wall.png", "path.png", "start.png", "goal.png", "step.png", "player.png"]]
+    background_image = pygame.image.load("background.png").convert()
+    alert_image = pygame.image.load("alert.png").convert_alpha()
+    impossible_image = pygame.image.load("impossible.png").convert()
+    alert_scaled = pygame.transform.smoothscale(alert_image, (400, 200)).convert_alpha()
+    impossible_scaled = pygame.transform.smoothscale(impossible_image, (400, 200)).convert()
+    font = pygame.font.Font(None, 36)
     
     manager = pygame_gui.UIManager((SCREEN_WIDTH, SCREEN_HEIGHT))
     solve_selector = pygame_gui.elements.UIDropDownMenu(['Búsqueda por Profundidad', 'Búsqueda por Amplitud'], 'Búsqueda por Profundidad', relative_rect=pygame.Rect((10, 10), (200, 40)), manager=manager)
@@ -156,6 +269,8 @@ def main():
 
     maze = Maze('laberinto.txt')
     cell_size = calculate_cell_size(maze)
+    tiles = build_scaled_tiles(images, cell_size)
+    maze.rebuild_cache(cell_size, tiles[0], tiles[1])
 
     clock = pygame.time.Clock()
     solved, num_explored = False, 0
@@ -163,15 +278,12 @@ def main():
     impossible_start_time, impossible_shown = None, False
     running = True
 
+    move_cooldown = 0
     while running:
         time_delta = clock.tick(30) / 1000.0
         for event in pygame.event.get():
             if event.type == pygame.KEYDOWN:
-                if event.key in (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT):
-                    direction = {pygame.K_UP: "up", pygame.K_DOWN: "down", pygame.K_LEFT: "left", pygame.K_RIGHT: "right"}[event.key]
-                    maze.move_player(direction)
-                    alert_shown = False
-                elif event.key == pygame.K_ESCAPE:
+                if event.key == pygame.K_ESCAPE:
                     running = False
 
             if event.type == pygame.USEREVENT and event.user_type == pygame_gui.UI_DROP_DOWN_MENU_CHANGED:
@@ -191,26 +303,41 @@ def main():
 
                 elif event.ui_element == maze_selector:
                     if event.text == 'Fácil':
-                        maze = Maze('laberinto.txt')
+                        maze.reload('laberinto.txt')
                     elif event.text == 'Medio':
-                        maze = Maze('laberinto2.txt')
+                        maze.reload('laberinto2.txt')
                     elif event.text == 'Dificil':
-                        maze = Maze('laberinto3.txt')
+                        maze.reload('laberinto3.txt')
                     elif event.text == 'Muy Dificil':
-                        maze = Maze('laberinto4.txt')
+                        maze.reload('laberinto4.txt')
                     elif event.text == 'Imposible':
-                        maze = Maze('laberinto5.txt')
-                    cell_size = calculate_cell_size(maze)
+                        maze.reload('laberinto5.txt')
+                    new_cell_size = calculate_cell_size(maze)
+                    if new_cell_size != cell_size:
+                        cell_size = new_cell_size
+                        tiles = build_scaled_tiles(images, cell_size)
+                    maze.rebuild_cache(cell_size, tiles[0], tiles[1])
                     solved = False
                     impossible_shown = False
 
             manager.process_events(event)
 
+        keys = pygame.key.get_pressed()
+        move_cooldown -= time_delta
+        for key, direction in KEY_DIRECTIONS.items():
+            if keys[key]:
+                if move_cooldown <= 0:
+                    maze.move_player(direction)
+                    alert_shown = False
+                    move_cooldown = MOVE_DELAY
+                break
+        else:
+            move_cooldown = 0
+
         screen.blit(background_image, (0, 0))
-        draw_maze(screen, maze, cell_size, images, show_solution=solved)
+        draw_maze(screen, maze, cell_size, tiles, show_solution=solved)
 
         if solved:
-            font = pygame.font.Font(None, 36)
             text = font.render(f"Estados explorados: {num_explored}", True, (0, 0, 0))
             screen.blit(text, (SCREEN_WIDTH - 300, 20))
 
@@ -220,7 +347,7 @@ def main():
         if impossible_start_time:
             elapsed_time = pygame.time.get_ticks() - impossible_start_time
             if elapsed_time <= 2000:
-                screen.blit(pygame.transform.scale(impossible_image, (400, 200)), (SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT // 2 - 100))
+                screen.blit(impossible_scaled, (SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT // 2 - 100))
             else:
                 impossible_start_time = None
                 impossible_shown = False
@@ -232,7 +359,7 @@ def main():
         if alert_start_time:
             elapsed_time = pygame.time.get_ticks() - alert_start_time
             if elapsed_time <= 2000:
-                screen.blit(pygame.transform.scale(alert_image, (400, 200)), (SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT // 2 - 100))
+                screen.blit(alert_scaled, (SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT // 2 - 100))
             else:
                 alert_start_time = None
 
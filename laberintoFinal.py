@@ -1,6 +1,14 @@
+import os
+os.environ.setdefault("PYGAME_BLEND_ALPHA_SDL2", "1")
+
 import pygame
 import pygame_gui
+from pygame._sdl2.sdl2 import error as SDLError
+from pygame._sdl2.video import Window, Renderer, Texture
+import numpy as np
 from collections import deque
+from functools import lru_cache
+import heapq
 import math 
 
 pygame.init()
@@ -8,6 +16,10 @@ pygame.init()
 info = pygame.display.Info()
 SCREEN_WIDTH, SCREEN_HEIGHT = info.current_w, info.current_h
 NAVBAR_HEIGHT = 60
+MOVE_DELAY = 0.15
+ACTIONS = ("up", "down", "left", "right")
+KEY_DIRECTIONS = {pygame.K_UP: "up", pygame.K_DOWN: "down", pygame.K_LEFT: "left", pygame.K_RIGHT: "right"}
+MAX_DIRTY_RECTS = 50
 
 class Node:
     def __init__(self, state, parent, action):
@@ -18,12 +30,14 @@ class Node:
 class StackFrontier:
     def __init__(self):
         self.frontier = []
+        self.states = set()
 
     def add(self, node):
         self.frontier.append(node)
+        self.states.add(node.state)
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.states
 
     def empty(self):
         return not self.frontier
@@ -31,17 +45,21 @@ class StackFrontier:
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
-        return self.frontier.pop()
+        node = self.frontier.pop()
+        self.states.discard(node.state)
+        return node
 
 class QueueFrontier:
     def __init__(self):
         self.frontier = deque()
+        self.states = set()
 
     def add(self, node):
         self.frontier.append(node)
+        self.states.add(node.state)
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.states
 
     def empty(self):
         return not self.frontier
@@ -49,20 +67,30 @@ class QueueFrontier:
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
-        return self.frontier.popleft()
+        node = self.frontier.popleft()
+        self.states.discard(node.state)
+        return node
 
 class GreedyFrontier:
     def __init__(self, goal):
         self.frontier = []
+        self.states = set()
         self.goal = goal
+        self.best_h = {}
+        self._tiebreak = 0
 
     def add(self, node):
         priority = abs(node.state[0] - self.goal[0]) + abs(node.state[1] - self.goal[1])
-        self.frontier.append((priority, node))
-        self.frontier.sort(key=lambda x: x[0])
+        # h no depende del camino: un estado ya encolado nunca mejora su prioridad.
+        if priority >= self.best_h.get(node.state, math.inf):
+            return
+        self.best_h[node.state] = priority
+        heapq.heappush(self.frontier, (priority, self._tiebreak, node))
+        self._tiebreak += 1
+        self.states.add(node.state)
 
     def contains_state(self, state):
-        return any(node.state == state for _, node in self.frontier)
+        return state in self.states
 
     def empty(self):
         return len(self.frontier) == 0
@@ -70,62 +98,209 @@ class GreedyFrontier:
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
-        return self.frontier.pop(0)[1]
+        node = heapq.heappop(self.frontier)[2]
+        self.states.discard(node.state)
+        return node
 
 
 class AStarFrontier:
     def __init__(self, start, goal):
         self.frontier = []
+        self.states = set()
         self.goal = goal
         self.start = start
         self.g_costs = {start: 0}
+        self.best_f = {}
+        self._tiebreak = 0
 
     def add(self, node):
         g = self.g_costs[node.parent.state] + 1 if node.parent else 0
-        h = abs(node.state[0] - self.goal[0]) + abs(node.state[1] - self.goal[1])
-        f = g + h
-        self.frontier.append((f, node))
+        f = g + self.heuristic(node.state)
+        # Solo se encola si mejora estrictamente la mejor f conocida del estado.
+        if f >= self.best_f.get(node.state, math.inf):
+            return
+        self.best_f[node.state] = f
         self.g_costs[node.state] = g
-        self.frontier.sort(key=lambda x: x[0])
+        heapq.heappush(self.frontier, (f, self._tiebreak, node))
+        self._tiebreak += 1
+        self.states.add(node.state)
+
+    def heuristic(self, state):
+        return abs(state[0] - self.goal[0]) + abs(state[1] - self.goal[1])
 
     def contains_state(self, state):
-        return any(node.state == state for _, node in self.frontier)
+        return state in self.states
+
+    def _discard_stale(self):
+        # Entradas superadas por una f menor del mismo estado (decrease-key perezoso).
+        while self.frontier and self.best_f[self.frontier[0][2].state] < self.frontier[0][0]:
+            heapq.heappop(self.frontier)
 
     def empty(self):
+        self._discard_stale()
         return len(self.frontier) == 0
 
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
-        return self.frontier.pop(0)[1]
+        node = heapq.heappop(self.frontier)[2]
+        self.states.discard(node.state)
+        return node
+
+    def top_priority(self):
+        """Devuelve el menor valor f de la frontera, o infinito si está vacía."""
+        return math.inf if self.empty() else self.frontier[0][0]
+
+class BalancedAStarFrontier(AStarFrontier):
+    """Frontera de A* con potencial promedio (h_meta - h_inicio) / 2.
+    Usada en ambas direcciones, la suma de los mínimos de cada frontera es cota inferior del mejor camino.
+    """
+
+    def heuristic(self, state):
+        to_goal = abs(state[0] - self.goal[0]) + abs(state[1] - self.goal[1])
+        to_start = abs(state[0] - self.start[0]) + abs(state[1] - self.start[1])
+        return (to_goal - to_start) / 2
+
+OPPOSITE_ACTIONS = {"up": "down", "down": "up", "left": "right", "right": "left"}
+
+class BidirAStarSolver:
+    """A* bidireccional: expande desde el inicio y desde la meta hasta que ambas búsquedas se encuentran."""
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.frontier_f = BalancedAStarFrontier(maze.start, maze.goal)
+        self.frontier_b = BalancedAStarFrontier(maze.goal, maze.start)
+        self.g_f = self.frontier_f.g_costs
+        self.g_b = self.frontier_b.g_costs
+        self.closed_f = set()
+        self.closed_b = set()
+        self.came_from_f = {}
+        self.came_from_b = {}
+        self.num_explored = 0
+
+    def _expand(self, frontier, g_this, g_other, closed_this, came_from_this):
+        """Expande el mejor nodo de una dirección y devuelve el mejor encuentro hallado (costo, estado)."""
+        node = frontier.remove()
+        best = (math.inf, None)
+        if node.state in closed_this:
+            return best
+        closed_this.add(node.state)
+        self.num_explored += 1
+
+        for action, state in self.maze.neighbors(node.state):
+            if state in closed_this:
+                continue
+            g = g_this[node.state] + 1
+            if state not in g_this or g < g_this[state]:
+                came_from_this[state] = (node.state, action)
+                frontier.add(Node(state=state, parent=node, action=action))
+            if state in g_other and g_this[state] + g_other[state] < best[0]:
+                best = (g_this[state] + g_other[state], state)
+        return best
+
+    def _reconstruct(self, meeting):
+        actions, cells = [], []
+        state = meeting
+        while state in self.came_from_f:
+            parent, action = self.came_from_f[state]
+            actions.append(action)
+            cells.append(state)
+            state = parent
+        actions.reverse(), cells.reverse()
+
+        state = meeting
+        while state in self.came_from_b:
+            parent, action = self.came_from_b[state]
+            actions.append(OPPOSITE_ACTIONS[action])
+            cells.append(parent)
+            state = parent
+        return actions, cells
+
+    def solve(self):
+        """Ejecuta la búsqueda completa. Devuelve la solución (acciones, celdas) o None si no existe."""
+        self.frontier_f.add(Node(state=self.maze.start, parent=None, action=None))
+        self.frontier_b.add(Node(state=self.maze.goal, parent=None, action=None))
+        best, meeting = math.inf, None
+
+        while not self.frontier_f.empty() and not self.frontier_b.empty():
+            # Con potenciales promedio, top_f + top_b acota por abajo cualquier camino aún no hallado.
+            if self.frontier_f.top_priority() + self.frontier_b.top_priority() >= best:
+                break
+            # Se expande la frontera más pequeña: las búsquedas se encuentran antes y,
+            # si no hay solución, la dirección encerrada se agota pronto.
+            if len(self.frontier_f.states) <= len(self.frontier_b.states):
+                cost, state = self._expand(self.frontier_f, self.g_f, self.g_b, self.closed_f, self.came_from_f)
+            else:
+                cost, state = self._expand(self.frontier_b, self.g_b, self.g_f, self.closed_b, self.came_from_b)
+            if cost < best:
+                best, meeting = cost, state
+
+        if meeting is None:
+            return None
+        return self._reconstruct(meeting)
+
+@lru_cache(maxsize=8)
+def _parse_maze(filename):
+    """Lee y analiza un archivo de laberinto. El resultado se comparte entre instancias, por eso las paredes son de solo lectura."""
+    with open(filename) as f:
+        contents = f.read()
+
+    if contents.count("A") != 1 or contents.count("B") != 1:
+        raise Exception("El laberinto debe tener exactamente un punto de inicio y un punto de meta")
+
+    contents = contents.splitlines()
+    height = len(contents)
+    width = max(len(line) for line in contents)
+    grid = np.array([list(line.ljust(width)) for line in contents])
+    walls = ~np.isin(grid, (' ', 'A', 'B'))
+    walls.flags.writeable = False
+    start = tuple(int(i) for i in np.argwhere(grid == 'A')[0])
+    goal = tuple(int(i) for i in np.argwhere(grid == 'B')[0])
+
+    open_cells = ~walls
+    idx = np.arange(height * width, dtype=np.int32).reshape(height, width)
+    adj = np.full((height, width, 4), -1, dtype=np.int32)
+    adj[1:, :, 0] = np.where(open_cells[1:] & open_cells[:-1], idx[:-1], -1)
+    adj[:-1, :, 1] = np.where(open_cells[:-1] & open_cells[1:], idx[1:], -1)
+    adj[:, 1:, 2] = np.where(open_cells[:, 1:] & open_cells[:, :-1], idx[:, :-1], -1)
+    adj[:, :-1, 3] = np.where(open_cells[:, :-1] & open_cells[:, 1:], idx[:, 1:], -1)
+    adj = adj.reshape(height * width, 4)
+    adj.flags.writeable = False
+    neighbor_table = tuple(tuple((ACTIONS[k], divmod(n, width)) for k, n in enumerate(row) if n >= 0) for row in adj.tolist())
+    return walls, adj, neighbor_table, start, goal, height, width
+
+_STATIC_SURFACES = {}
+_SOLUTION_CACHE = {}
 
 class Maze:
     def __init__(self, filename):
-        with open(filename) as f:
-            contents = f.read()
-
-        if contents.count("A") != 1 or contents.count("B") != 1:
-            raise Exception("El laberinto debe tener exactamente un punto de inicio y un punto de meta")
-
-        contents = contents.splitlines()
-        self.height = len(contents)
-        self.width = max(len(line) for line in contents)
-        self.walls = [[True if cell != ' ' and cell != 'A' and cell != 'B' else False for cell in line] for line in contents]
-        self.start = [(i, j) for i, line in enumerate(contents) for j, cell in enumerate(line) if cell == 'A'][0]
-        self.goal = [(i, j) for i, line in enumerate(contents) for j, cell in enumerate(line) if cell == 'B'][0]
+        self.explored = set()
+        self.frontier_nodes = []
+        self.static_surface = None
+        self.green_cell = None
+        self.explored_overlay = None
+        self.explored_texture = None
+        self.cell_size = None
+        self.reload(filename)
+
+    def reload(self, filename):
+        """Carga otro archivo en este mismo objeto y reinicia el estado de la búsqueda.
+        Las superficies ya creadas se conservan para que rebuild_cache las reutilice si el tamaño coincide.
+        """
+        self.filename = filename
+        self.walls, self.adj, self._neighbor_table, self.start, self.goal, self.height, self.width = _parse_maze(filename)
 
         self.solution = None
         self.player_pos = self.start
         self.num_explored = 0
         self.solution_found = False
-        self.explored = set() 
-        self.frontier_nodes = []
+        self.explored.clear()
+        self.frontier_nodes.clear()
+        self.last_explored = None
 
     def neighbors(self, state):
         """Devuelve los vecinos válidos de un estado en el laberinto."""
-        row, col = state
-        candidates = [("up", (row - 1, col)), ("down", (row + 1, col)), ("left", (row, col - 1)), ("right", (row, col + 1))]
-        return [(action, (r, c)) for action, (r, c) in candidates if 0 <= r < self.height and 0 <= c < self.width and not self.walls[r][c]]
+        return self._neighbor_table[state[0] * self.width + state[1]]
 
     def step(self, frontier):
         """Realiza un paso en el proceso de resolución del laberinto, explorando un nodo.
@@ -147,6 +322,17 @@ class Maze:
                 return True
 
             self.explored.add(node.state)
+            self.last_explored = node.state
+            if self.explored_overlay:
+                row, col = node.state
+                cell = (col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size)
+                self.explored_overlay.fill((255, 0, 0), cell)
+                if self.explored_texture:
+                    renderer = self.explored_texture.renderer
+                    renderer.target = self.explored_texture
+                    renderer.draw_color = (255, 0, 0, 255)
+                    renderer.fill_rect(cell)
+                    renderer.target = None
 
             self.frontier_nodes.clear()
             for action, state in self.neighbors(node.state):
@@ -167,6 +353,10 @@ class Maze:
         self.solution_found = False
         self.solution = None
         self.frontier_nodes = []
+        if self.explored_overlay:
+            self.explored_overlay.fill((0, 0, 0, 0))
+        if self.explored_texture:
+            self.clear_explored_texture()
     
     def solve_dfs(self):
         """Resuelve el laberinto utilizando búsqueda por profundidad."""
@@ -186,6 +376,62 @@ class Maze:
         frontier = AStarFrontier(self.start, self.goal)
         self.solve(frontier)
 
+    def solve_bidir_a_star(self):
+        """Resuelve el laberinto por completo con A* bidireccional. Devuelve True si encontró la solución.
+        El resultado se guarda por archivo, así que repetir la búsqueda en el mismo laberinto es inmediato.
+        """
+        key = (self.filename, "bidir_a_star")
+        if key not in _SOLUTION_CACHE:
+            solver = BidirAStarSolver(self)
+            _SOLUTION_CACHE[key] = (solver.solve(), solver.num_explored, frozenset(solver.closed_f | solver.closed_b))
+        self.solution, self.num_explored, explored = _SOLUTION_CACHE[key]
+        self.explored = set(explored)
+        self.solution_found = self.solution is not None
+        self.frontier_nodes = []
+        return self.solution_found
+
+    def rebuild_cache(self, cell_size, wall_img, path_img):
+        """Pre-renderiza paredes y caminos en una sola superficie para el tamaño de celda dado,
+        junto con la capa de celdas exploradas y la celda de frontera de la animación de búsqueda.
+        """
+        self.cell_size = cell_size
+        key = (self.filename, cell_size)
+        if key not in _STATIC_SURFACES:
+            surface = pygame.Surface((self.width * cell_size, self.height * cell_size)).convert()
+            surface.fblits([(wall_img if wall else path_img, (j * cell_size, i * cell_size))
+                            for i, row in enumerate(self.walls) for j, wall in enumerate(row)])
+            _STATIC_SURFACES[key] = surface
+        self.static_surface = _STATIC_SURFACES[key]
+        if self.green_cell is None or self.green_cell.get_width() != cell_size:
+            self.green_cell = pygame.Surface((cell_size, cell_size)).convert()
+            self.green_cell.fill((0, 255, 0))
+        if self.explored_overlay is None or self.explored_overlay.get_size() != self.static_surface.get_size():
+            self.explored_overlay = pygame.Surface(self.static_surface.get_size(), pygame.SRCALPHA).convert_alpha()
+        else:
+            self.explored_overlay.fill((0, 0, 0, 0))
+        for row, col in self.explored:
+            self.explored_overlay.fill((255, 0, 0), (col * cell_size, row * cell_size, cell_size, cell_size))
+
+    def build_explored_texture(self, renderer):
+        """Crea en la GPU el equivalente de explored_overlay: una textura destino que step() pinta celda a celda."""
+        self.explored_texture = Texture(renderer, self.static_surface.get_size(), target=True)
+        self.explored_texture.blend_mode = pygame.BLENDMODE_BLEND
+        self.clear_explored_texture()
+        renderer.target = self.explored_texture
+        renderer.draw_color = (255, 0, 0, 255)
+        for row, col in self.explored:
+            renderer.fill_rect((col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size))
+        renderer.target = None
+        return self.explored_texture
+
+    def clear_explored_texture(self):
+        """Deja transparente la capa de celdas exploradas en la GPU."""
+        renderer = self.explored_texture.renderer
+        renderer.target = self.explored_texture
+        renderer.draw_color = (0, 0, 0, 0)
+        renderer.clear()
+        renderer.target = None
+
     def move_player(self, direction):
         """Mueve al jugador en la dirección especificada si es una posición válida."""
         row, col = self.player_pos
@@ -195,7 +441,7 @@ class Maze:
             "left": (row, col - 1),
             "right": (row, col + 1)
         }.get(direction)
-        if new_pos and 0 <= new_pos[0] < self.height and 0 <= new_pos[1] < self.width and not self.walls[new_pos[0]][new_pos[1]]:
+        if new_pos and 0 <= new_pos[0] < self.height and 0 <= new_pos[1] < self.width and not self.walls[new_pos]:
             self.player_pos = new_pos
 
 
@@ -203,44 +449,114 @@ def calculate_cell_size(maze):
     cell_width, cell_height = SCREEN_WIDTH // maze.width, (SCREEN_HEIGHT - NAVBAR_HEIGHT) // maze.height
     return min(cell_width, cell_height)
 
-def draw_maze(screen, maze, cell_size, images, show_solution=False):
-    wall_img, path_img, start_img, goal_img, step_img, player_img = (pygame.transform.scale(img, (cell_size, cell_size)) for img in images)
+def maze_offset(maze, cell_size):
     maze_width_in_pixels = maze.width * cell_size
     maze_height_in_pixels = maze.height * cell_size
     offset_x = (SCREEN_WIDTH - maze_width_in_pixels) // 2
     offset_y = (SCREEN_HEIGHT - NAVBAR_HEIGHT - maze_height_in_pixels) // 2 + NAVBAR_HEIGHT
-
-    for i, row in enumerate(maze.walls):
-        for j, wall in enumerate(row):
-            img = wall_img if wall else path_img
-            screen.blit(img, (j * cell_size + offset_x, i * cell_size + offset_y))
+    return offset_x, offset_y
+
+def build_scaled_tiles(images, cell_size):
+    return [pygame.transform.scale(img, (cell_size, cell_size)).convert_alpha() for img in images]
+
+def cell_rect(state, cell_size, offset_x, offset_y):
+    return pygame.Rect(state[1] * cell_size + offset_x, state[0] * cell_size + offset_y, cell_size, cell_size)
+
+def visible_cell_rects(states, maze, cell_size, clip):
+    """Devuelve los rectángulos de las casillas que caen dentro de la zona visible del laberinto.
+    Las que quedan fuera de `clip` se descartan aquí, antes de pagar la llamada de dibujo de cada una.
+    """
+    offset_x, offset_y = maze_offset(maze, cell_size)
+    visible = pygame.Rect(offset_x, offset_y, maze.width * cell_size, maze.height * cell_size).clip(clip)
+    rects = [cell_rect(state, cell_size, offset_x, offset_y) for state in states]
+    return [rects[i] for i in visible.collidelistall(rects)]
+
+def create_renderer():
+    """Crea una ventana con el renderizador SDL2 acelerado por hardware. Devuelve None si no está disponible."""
+    window = Window("Laberinto Interactivo", (SCREEN_WIDTH, SCREEN_HEIGHT), fullscreen=True)
+    try:
+        return Renderer(window, accelerated=1, vsync=True)
+    except SDLError:
+        window.destroy()
+        return None
+
+def build_textures(renderer, maze, tiles):
+    """Sube a la GPU el tablero pre-renderizado y las casillas dinámicas del laberinto."""
+    textures = {"board": Texture.from_surface(renderer, maze.static_surface)}
+    for name, tile in zip(("start", "goal", "step", "player"), tiles[2:]):
+        textures[name] = Texture.from_surface(renderer, tile)
+    textures["explored"] = maze.build_explored_texture(renderer)
+    return textures
+
+def ui_bounds(manager):
+    """Devuelve el rectángulo que cubre todos los elementos visibles de la interfaz."""
+    rects = [sprite.rect for sprite in manager.get_sprite_group().sprites()
+             if sprite.image is not None and sprite.image.get_width() > 0]
+    return rects[0].unionall(rects[1:]) if rects else pygame.Rect(0, 0, 0, 0)
+
+def draw_maze(screen, maze, cell_size, tiles, show_solution=False):
+    start_img, goal_img, step_img, player_img = tiles[2:]
+    offset_x, offset_y = maze_offset(maze, cell_size)
+
+    screen.blit(maze.static_surface, (offset_x, offset_y))
 
     if show_solution and maze.solution:
-        for cell in maze.solution[1]:
-            screen.blit(step_img, (cell[1] * cell_size + offset_x, cell[0] * cell_size + offset_y))
+        screen.fblits([(step_img, (cell[1] * cell_size + offset_x, cell[0] * cell_size + offset_y)) for cell in maze.solution[1]])
 
     screen.blit(start_img, (maze.start[1] * cell_size + offset_x, maze.start[0] * cell_size + offset_y))
     screen.blit(goal_img, (maze.goal[1] * cell_size + offset_x, maze.goal[0] * cell_size + offset_y))
     screen.blit(player_img, (maze.player_pos[1] * cell_size + offset_x, maze.player_pos[0] * cell_size + offset_y))
 
+def draw_maze_gpu(renderer, maze, cell_size, textures, show_solution=False):
+    """Equivalente de draw_maze para el renderizador SDL2: las copias se agrupan y se envían en present()."""
+    offset_x, offset_y = maze_offset(maze, cell_size)
+
+    textures["board"].draw(dstrect=(offset_x, offset_y, maze.width * cell_size, maze.height * cell_size))
+
+    if show_solution and maze.solution:
+        for cell in maze.solution[1]:
+            textures["step"].draw(dstrect=cell_rect(cell, cell_size, offset_x, offset_y))
+
+    textures["start"].draw(dstrect=cell_rect(maze.start, cell_size, offset_x, offset_y))
+    textures["goal"].draw(dstrect=cell_rect(maze.goal, cell_size, offset_x, offset_y))
+    textures["player"].draw(dstrect=cell_rect(maze.player_pos, cell_size, offset_x, offset_y))
+
 def main():
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
-    pygame.display.set_caption("Laberinto Interactivo")
+    # Ventana oculta de 1x1 solo para fijar el formato de convert(), que también usa pygame_gui.
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    renderer = create_renderer()
+    if renderer:
+        # Capa transparente para la interfaz y los textos; el resto se dibuja con texturas.
+        screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+    else:
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
+        pygame.display.set_caption("Laberinto Interactivo")
     
-    images = [pygame.image.load(img) for img in ["wall.png", "path.png", "start.png", "goal.png", "step.png", "player.png"]]
-    background_image = pygame.image.load("background.png")
-    alert_image = pygame.image.load("alert.png")
-    impossible_image = pygame.image.load("impossible.png")
+    images = [pygame.image.load(img).convert_alpha() for img in ["wall.png", "path.png", "start.png", "goal.png", "step.png", "player.png"]]
+    background_image = pygame.image.load("background.png").convert()
+    alert_image = pygame.image.load("alert.png").convert_alpha()
+    alert_scaled = pygame.transform.smoothscale(alert_image, (400, 200)).convert_alpha()
+    font = pygame.font.Font(None, 36)
     
     manager = pygame_gui.UIManager((SCREEN_WIDTH, SCREEN_HEIGHT))
     solve_selector = pygame_gui.elements.UIDropDownMenu(
-        ['Búsqueda por Profundidad', 'Búsqueda por Amplitud', 'Greedy', 'A*'],
+        ['Búsqueda por Profundidad', 'Búsqueda por Amplitud', 'Greedy', 'A*', 'A* Bidireccional'],
         'Búsqueda por Profundidad', relative_rect=pygame.Rect((10, 10), (200, 40)), manager=manager
     )
     maze_selector = pygame_gui.elements.UIDropDownMenu(['Fácil', 'Medio', "Dificil", "Muy Dificil", "Imposible"], 'Fácil', relative_rect=pygame.Rect((230, 10), (200, 40)), manager=manager)
     
     maze = Maze('laberinto.txt')
     cell_size = calculate_cell_size(maze)
+    tiles = build_scaled_tiles(images, cell_size)
+    maze.rebuild_cache(cell_size, tiles[0], tiles[1])
+
+    if renderer:
+        background_texture = Texture.from_surface(renderer, background_image)
+        alert_texture = Texture.from_surface(renderer, alert_scaled)
+        ui_texture = Texture.from_surface(renderer, screen)
+        ui_texture.blend_mode = pygame.BLENDMODE_BLEND
+        textures = build_textures(renderer, maze, tiles)
+        prev_ui_area = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
 
     frontier = None
     solving = False
@@ -253,17 +569,23 @@ def main():
     alert_start_time, alert_shown = None, False
     impossible_start_time, impossible_shown = None, False
 
+    dirty = []
+    full_redraw = True
+    prev_player_rect = None
+    prev_frontier_rects = []
+    prev_frame_state = None
+
     running = True
+    move_cooldown = 0
     while running:
         time_delta = clock.tick(30) / 1000.0
         for event in pygame.event.get():
             if event.type == pygame.KEYDOWN:
-                if event.key in (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT):
-                    direction = {pygame.K_UP: "up", pygame.K_DOWN: "down", pygame.K_LEFT: "left", pygame.K_RIGHT: "right"}[event.key]
-                    maze.move_player(direction)
-                    alert_shown = False
-                elif event.key == pygame.K_ESCAPE:
+                if event.key == pygame.K_ESCAPE:
                     running = False
+            else:
+                # Cualquier otro evento (ratón, interfaz, ventana) puede cambiar zonas arbitrarias.
+                full_redraw = True
 
             if event.type == pygame.USEREVENT and event.user_type == pygame_gui.UI_DROP_DOWN_MENU_CHANGED:
                 if event.ui_element == solve_selector:
@@ -272,59 +594,60 @@ def main():
                     elif event.text == 'Búsqueda por Amplitud':
                         frontier = QueueFrontier()
                     elif event.text == 'Greedy':
-                        maze.solve_greedy()
+                        frontier = GreedyFrontier(maze.goal)
                     elif event.text == 'A*':
-                        maze.solve_a_star()
-
-                    maze.solve(frontier)
-                    solving = True
+                        frontier = AStarFrontier(maze.start, maze.goal)
+
+                    if event.text == 'A* Bidireccional':
+                        maze.solve_bidir_a_star()
+                        solving = False
+                    else:
+                        maze.solve(frontier)
+                        solving = True
                     solved = False
                     move_step = 0
 
                 elif event.ui_element == maze_selector:
                     if event.text == 'Fácil':
-                        maze = Maze('laberinto.txt')
+                        maze.reload('laberinto.txt')
                     elif event.text == 'Medio':
-                        maze = Maze('laberinto2.txt')
+                        maze.reload('laberinto2.txt')
                     elif event.text == 'Dificil':
-                        maze = Maze('laberinto3.txt')
+                        maze.reload('laberinto3.txt')
                     elif event.text == 'Muy Dificil':
-                        maze = Maze('laberinto4.txt')
+                        maze.reload('laberinto4.txt')
                     elif event.text == 'Imposible':
-                        maze = Maze('laberinto5.txt')
-                    cell_size = calculate_cell_size(maze)
+                        maze.reload('laberinto5.txt')
+                    new_cell_size = calculate_cell_size(maze)
+                    if new_cell_size != cell_size:
+                        cell_size = new_cell_size
+                        tiles = build_scaled_tiles(images, cell_size)
+                    maze.rebuild_cache(cell_size, tiles[0], tiles[1])
+                    if renderer:
+                        textures = build_textures(renderer, maze, tiles)
                     solving = False
                     solved = False
                     move_step = 0
 
             manager.process_events(event)
-        
-        screen.blit(background_image, (0, 0))
-        draw_maze(screen, maze, cell_size, images, show_solution=solved)
 
-        if solved:
-            font = pygame.font.Font(None, 36)
-            text = font.render(f"Estados explorados: {maze.num_explored}", True, (0, 0, 0))
-            screen.blit(text, (SCREEN_WIDTH - 300, 20))
+        keys = pygame.key.get_pressed()
+        move_cooldown -= time_delta
+        for key, direction in KEY_DIRECTIONS.items():
+            if keys[key]:
+                if move_cooldown <= 0:
+                    maze.move_player(direction)
+                    alert_shown = False
+                    move_cooldown = MOVE_DELAY
+                break
+        else:
+            move_cooldown = 0
 
         manager.update(time_delta)
-        manager.draw_ui(screen)
 
-        maze_width_in_pixels = maze.width * cell_size
-        maze_height_in_pixels = maze.height * cell_size
-        offset_x = (SCREEN_WIDTH - maze_width_in_pixels) // 2
-        offset_y = (SCREEN_HEIGHT - NAVBAR_HEIGHT - maze_height_in_pixels) // 2 + NAVBAR_HEIGHT
-
-        if solving and not solved:
+        animating = solving and not solved
+        if animating:
             solving = not maze.step(frontier)
-            
-            for node in maze.frontier_nodes:
-                pygame.draw.rect(screen, (0, 255, 0), 
-                    (node.state[1] * cell_size + offset_x, node.state[0] * cell_size + offset_y, cell_size, cell_size))
-            
-            for explored in maze.explored:
-                pygame.draw.rect(screen, (255, 0, 0), 
-                    (explored[1] * cell_size + offset_x, explored[0] * cell_size + offset_y, cell_size, cell_size))
 
         if maze.solution_found and move_step < len(maze.solution[1]):
             target_cell = maze.solution[1][move_step]
@@ -339,14 +662,89 @@ def main():
             alert_start_time = pygame.time.get_ticks()
             alert_shown = True
         
+        alert_visible = False
         if alert_start_time:
             elapsed_time = pygame.time.get_ticks() - alert_start_time
             if elapsed_time <= 2000:
-                screen.blit(pygame.transform.scale(alert_image, (400, 200)), (SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT // 2 - 100))
+                alert_visible = True
             else:
                 alert_start_time = None
 
-        pygame.display.flip()
+        offset_x, offset_y = maze_offset(maze, cell_size)
+        text = font.render(f"Estados explorados: {maze.num_explored}", True, (0, 0, 0)) if solved else None
+
+        if renderer:
+            renderer.draw_color = (0, 0, 0, 255)
+            renderer.clear()
+            background_texture.draw(dstrect=background_image.get_rect())
+            draw_maze_gpu(renderer, maze, cell_size, textures, show_solution=solved)
+
+            if animating:
+                renderer.draw_color = (0, 255, 0, 255)
+                for rect in visible_cell_rects((node.state for node in maze.frontier_nodes), maze, cell_size, screen.get_clip()):
+                    renderer.fill_rect(rect)
+                textures["explored"].draw(dstrect=(offset_x, offset_y, maze.width * cell_size, maze.height * cell_size))
+
+            # Solo se sube la zona ocupada por la interfaz (más la del cuadro anterior, para borrarla).
+            ui_area = ui_bounds(manager)
+            if text:
+                ui_area.union_ip(text.get_rect(topleft=(SCREEN_WIDTH - 300, 20)))
+            upload_area = ui_area.union(prev_ui_area).clip(screen.get_rect())
+            screen.fill((0, 0, 0, 0), upload_area)
+            if text:
+                screen.blit(text, (SCREEN_WIDTH - 300, 20))
+            manager.draw_ui(screen)
+            if upload_area.width and upload_area.height:
+                # Se pasa como tupla: Texture.update ignora la posición si recibe un Rect.
+                ui_texture.update(screen.subsurface(upload_area), tuple(upload_area))
+            ui_texture.draw()
+            prev_ui_area = ui_area
+
+            if alert_visible:
+                alert_texture.draw(dstrect=(SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT // 2 - 100, 400, 200))
+
+            renderer.present()
+            continue
+
+        screen.blit(background_image, (0, 0))
+        draw_maze(screen, maze, cell_size, tiles, show_solution=solved)
+
+        if text:
+            screen.blit(text, (SCREEN_WIDTH - 300, 20))
+
+        manager.draw_ui(screen)
+
+        frontier_rects = []
+        if animating:
+            frontier_rects = visible_cell_rects((node.state for node in maze.frontier_nodes), maze, cell_size, screen.get_clip())
+            screen.fblits([(maze.green_cell, rect) for rect in frontier_rects])
+            screen.blit(maze.explored_overlay, (offset_x, offset_y))
+
+            if maze.last_explored:
+                dirty.append(cell_rect(maze.last_explored, cell_size, offset_x, offset_y))
+        dirty.extend(frontier_rects)
+        dirty.extend(prev_frontier_rects)
+        prev_frontier_rects = frontier_rects
+
+        if alert_visible:
+            screen.blit(alert_scaled, (SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT // 2 - 100))
+
+        player_rect = cell_rect(maze.player_pos, cell_size, offset_x, offset_y)
+        dirty.append(player_rect)
+        if prev_player_rect:
+            dirty.append(prev_player_rect)
+        prev_player_rect = player_rect
+        dirty.append(pygame.Rect(0, 0, SCREEN_WIDTH, NAVBAR_HEIGHT))
+
+        # Al empezar/terminar la animación o mostrar/ocultar la alerta cambia casi toda la pantalla.
+        frame_state = (animating, solved, alert_visible)
+        if full_redraw or frame_state != prev_frame_state or len(dirty) > MAX_DIRTY_RECTS:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
+        dirty.clear()
+        full_redraw = False
+        prev_frame_state = frame_state
 
     pygame.quit()
 